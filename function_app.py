@@ -1,109 +1,347 @@
 import azure.functions as func
-import json
+from azure.core.exceptions import AzureError, HttpResponseError
+from binascii import Error as Base64Error
+import asyncio
+import gzip
 import logging
-from time import time
-from azure.storage.blob import BlobServiceClient
-import base64
+from dataclasses import MISSING, dataclass, field, fields
+from email.utils import parsedate_to_datetime
+from time import monotonic_ns, time
+import functools
+import io
 import os
-import requests
+import re
+import httpx
+import orjson
+import pybase64
 
 # Initialize the Function App with HTTP authentication level set to Anonymous
 app = func.FunctionApp(http_auth_level=func.AuthLevel.ANONYMOUS)
 
-# Configuration variables retrieved from environment variables
-connection_string = os.environ.get('AZURE_STORAGE_CONNECTION_STRING')
-container_name = os.environ.get('CONTAINER_NAME')
-refresh_url = os.environ.get('REFRESH_URL')
-chatbot_url = os.environ.get('CHATBOT_URL')
-api_key = os.environ.get('API_KEY')
+logger = logging.getLogger(__name__)
 
-# Initialize the BlobServiceClient with the connection string
-blob_service_client = BlobServiceClient.from_connection_string(
-    connection_string)
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Configuration variables retrieved from environment variables.
+    Each field is read from the environment variable named in its metadata.
+    Fields with a default are optional, and boolean fields accept 'true', '1' or 'yes'.
+    """
+    connection_string: str = field(
+        metadata={"env": "AZURE_STORAGE_CONNECTION_STRING"})
+    container_name: str = field(metadata={"env": "CONTAINER_NAME"})
+    refresh_url: str = field(metadata={"env": "REFRESH_URL"})
+    chatbot_url: str = field(metadata={"env": "CHATBOT_URL"})
+    api_key: str = field(metadata={"env": "API_KEY"})
+    # The backends return the response body directly instead of wrapping it in a 'body' key
+    unwrapped_responses: bool = field(
+        default=False, metadata={"env": "BACKEND_UNWRAPPED_RESPONSES"})
+    # The backends accept gzip-compressed request bodies
+    gzip_requests: bool = field(
+        default=False, metadata={"env": "BACKEND_GZIP_REQUESTS"})
+
+    @classmethod
+    def from_env(cls):
+        """
+        Builds the configuration from the environment variables.
+
+        Returns:
+            Config: The loaded configuration.
+
+        Raises:
+            RuntimeError: If any of the required environment variables is missing, empty or malformed.
+        """
+        missing = [
+            f.metadata["env"] for f in fields(cls)
+            if f.default is MISSING and not os.environ.get(f.metadata["env"])
+        ]
+        if missing:
+            raise RuntimeError(
+                f"Missing required environment variables: {', '.join(missing)}")
+
+        values = {}
+        for f in fields(cls):
+            value = os.environ.get(f.metadata["env"])
+            if not value:
+                continue
+            if f.type is bool:
+                value = value.lower() in ("true", "1", "yes")
+            values[f.name] = value
+
+        # The connection string is only parsed by the Blob Storage SDK on the first upload,
+        # so check its key=value form here to fail at cold start instead
+        segments = values["connection_string"].rstrip(";").split(";")
+        if not all("=" in segment for segment in segments):
+            raise RuntimeError(
+                "Malformed environment variable: AZURE_STORAGE_CONNECTION_STRING")
+        return cls(**values)
+
+
+# Load and validate the configuration once at cold start
+config = Config.from_env()
+
+# Headers that stay the same for the lifetime of the process
+OUTBOUND_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept-Encoding": "gzip, br",
+    "api-key": config.api_key
+}
+GZIP_OUTBOUND_HEADERS = {**OUTBOUND_HEADERS, "Content-Encoding": "gzip"}
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Outbound request bodies larger than this are sent gzip-compressed,
+# when the backends accept compressed request bodies
+GZIP_MIN_SIZE = 1024
+
+# Maximum number of questions accepted by a single chatbot_batch request
+MAX_BATCH_SIZE = 20
+
+# Unwrapped base64 content, checked before any decoding is done
+BASE64_PATTERN = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+# Block size used both for decoding uploads and for the Put Block calls
+BLOCK_SIZE = 4 * 1024 * 1024
+
+# Transient backend errors are retried with exponential backoff (0.5s, 1s, 2s),
+# or after the server's Retry-After delay (capped) when it sends one
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRY_AFTER_STATUS_CODES = frozenset({413, 429, 503})
+RETRY_AFTER_MAX = 30
+
+# Shared async HTTP client so warm instances multiplex concurrent backend calls
+# over pooled HTTP/2 keep-alive connections instead of blocking a worker thread
+client = httpx.AsyncClient(
+    timeout=httpx.Timeout(30.0, connect=3.0),
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        retries=RETRY_TOTAL
+    )
+)
+
+
+class Base64DecodeStream(io.RawIOBase):
+    """
+    Read-only file-like object that decodes a base64 string one block at a time.
+    This lets the Blob Storage SDK consume the decoded file without holding a full copy in memory.
+
+    Args:
+        encoded (str): The base64-encoded content.
+        block_size (int, optional): The approximate number of decoded bytes produced per block. Defaults to BLOCK_SIZE.
+    """
+
+    def __init__(self, encoded, block_size=BLOCK_SIZE):
+        self._encoded = encoded
+        # Slices of the encoded string must be a multiple of 4 characters to decode on their own
+        self._chunk_size = (block_size // 3) * 4
+        self._position = 0
+        self._buffer = b""
+        self._offset = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._offset >= len(self._buffer):
+            if self._position >= len(self._encoded):
+                return 0
+            chunk = self._encoded[self._position:self._position + self._chunk_size]
+            self._position += len(chunk)
+            self._buffer = pybase64.b64decode(chunk, validate=True)
+            self._offset = 0
+
+        size = min(len(b), len(self._buffer) - self._offset)
+        b[:size] = self._buffer[self._offset:self._offset + size]
+        self._offset += size
+        return size
+
+
+def decoded_length(encoded):
+    """
+    Computes the number of bytes a base64 string decodes to without decoding it.
+
+    Args:
+        encoded (str): The base64-encoded content.
+
+    Returns:
+        int: The length of the decoded content.
+    """
+    return len(encoded) * 3 // 4 - (len(encoded) - len(encoded.rstrip("=")))
+
+
+@functools.lru_cache(maxsize=1)
+def get_container_client():
+    """
+    Returns the ContainerClient shared by every upload, so blob clients reuse its pipeline.
+    The Blob Storage SDK is imported and the client built on first use, keeping them out of
+    cold starts that only serve refresh or chatbot requests.
+
+    Returns:
+        ContainerClient: The client for the configured container.
+    """
+    from azure.storage.blob import BlobServiceClient
+
+    # Initialize the BlobServiceClient with the connection string
+    blob_service_client = BlobServiceClient.from_connection_string(
+        config.connection_string,
+        max_single_put_size=BLOCK_SIZE,
+        max_block_size=BLOCK_SIZE
+    )
+    return blob_service_client.get_container_client(config.container_name)
+
+
+def retry_delay(response, attempt):
+    """
+    Computes how long to wait before retrying a failed request.
+    Like urllib3's Retry, a Retry-After header on 413, 429 and 503 responses takes precedence
+    over the exponential backoff.
+
+    Args:
+        response (httpx.Response): The failed response.
+        attempt (int): The zero-based number of the attempt that failed.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and response.status_code in RETRY_AFTER_STATUS_CODES:
+        # The header is either a number of seconds or an HTTP date
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0.0), RETRY_AFTER_MAX)
+
+    return RETRY_BACKOFF_FACTOR * 2 ** attempt
+
+
+async def post_with_retry(url, content):
+    """
+    Sends a POST request with the API key, retrying transient error responses after retry_delay.
+    Connection failures are already retried by the client transport.
+    If the backends accept it, bodies larger than GZIP_MIN_SIZE are gzip-compressed.
+    Compressed responses are decoded by the client.
+
+    Args:
+        url (str): The URL to send the POST request to.
+        content (bytes): The serialized JSON request body.
+
+    Returns:
+        httpx.Response: The last response received from the server.
+    """
+    headers = OUTBOUND_HEADERS
+    if config.gzip_requests and len(content) > GZIP_MIN_SIZE:
+        content = gzip.compress(content, compresslevel=5)
+        headers = GZIP_OUTBOUND_HEADERS
+
+    for attempt in range(RETRY_TOTAL + 1):
+        response = await client.post(url, headers=headers, content=content)
+        if response.status_code not in RETRY_STATUS_CODES or attempt == RETRY_TOTAL:
+            return response
+
+        delay = retry_delay(response, attempt)
+        logger.warning(
+            "POST request to %s failed with HTTP %s, retrying in %s seconds",
+            url, response.status_code, delay)
+        await asyncio.sleep(delay)
 
 
-def make_post_request(url, api_key, json_data={}):
+async def make_post_request(url, json_data={}):
     """
-    Makes a POST request to the specified URL with the provided API key and JSON data.
+    Makes a POST request to the specified URL with the API key and the provided JSON data.
     This is like a bridge between the Frontend and the Backend services.
 
     Args:
         url (str): The URL to send the POST request to.
-        api_key (str): The API key to include in the request headers for authentication.
         json_data (dict, optional): The JSON data to include in the request body. Defaults to None.
 
     Returns:
-        func.HttpResponse: The response from the server.
+        tuple[int, dict | bytes]: The status code and the body to return to the Frontend.
+            The body is the raw JSON object when the backend responses are unwrapped.
+            Raw bodies are not validated beyond starting with '{' and ending with '}'.
 
     Raises:
         None
     """
-    headers = {
-        "Content-Type": "application/json",
-        "api-key": api_key
-    }
-
-    response = requests.post(url, headers=headers, json=json_data)
+    response = await post_with_retry(url, orjson.dumps(json_data))
     if response.status_code != 200:
-        logging.error(
-            f"An error occurred while making a POST request to {url} (HTTP {response.status_code}): {response.text}"
-        )
-        return func.HttpResponse(
-            body=json.dumps({"result": "Internal Server Error"}),
-            status_code=500,
-            headers={"Content-Type": "application/json"}
+        logger.error(
+            "An error occurred while making a POST request to %s (HTTP %s): %s",
+            url, response.status_code, response.text
         )
+        return 500, {"result": "Internal Server Error"}
 
-    logging.info(
-        f"Successfully made a POST request to {url} (HTTP {response.status_code}): {response.text}"
-    )
+    logger.info(
+        "Successfully made a POST request to %s (HTTP %s)", url, response.status_code)
+
+    # Unwrapped JSON objects are passed through as-is, without being parsed.
+    # Only the first and last bytes are checked, so the backend is trusted to send valid JSON;
+    # anything that does not look like a complete object is parsed below instead.
+    if (config.unwrapped_responses and response.content.startswith(b"{")
+            and response.content.rstrip().endswith(b"}")):
+        return response.status_code, response.content
 
     try:
-        response_body = response.json()
-        logging.info(f"Response body: {response_body}")
-    except json.JSONDecodeError:
-        logging.warning(
-            f"The response from {url} is not a valid JSON string, returning the response as is: {response.text}"
-        )
-        return func.HttpResponse(
-            body=json.dumps({"result": response.text}),
-            status_code=response.status_code,
-            headers={"Content-Type": "application/json"}
-        )
+        response_body = orjson.loads(response.content)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response body: %s", response_body)
+    except orjson.JSONDecodeError:
+        logger.warning(
+            "The response from %s is not a valid JSON string, returning the response as is", url)
+        return response.status_code, {"result": response.text}
+
+    if config.unwrapped_responses and isinstance(response_body, dict):
+        return response.status_code, response_body
 
     if "body" not in response_body:
-        logging.error(
-            f"No 'body' key found in the response from {url}, returning an internal server error response"
-        )
-        return func.HttpResponse(
-            body=json.dumps({"result": "Internal Server Error"}),
-            status_code=500,
-            headers={"Content-Type": "application/json"}
-        )
+        logger.error(
+            "No 'body' key found in the response from %s, returning an internal server error response", url)
+        return 500, {"result": "Internal Server Error"}
 
-    # Return the actual response body with the same status code and content type
-    return func.HttpResponse(
-        body=json.dumps(response_body["body"]),
-        status_code=response.status_code,
-        headers={"Content-Type": "application/json"}
-    )
+    # Return the actual response body with the same status code
+    return response.status_code, response_body["body"]
 
 
-def method_not_allowed():
+def dump_with_processing_time(body, processing_time):
     """
-    Returns an HTTP response with status code 405 (Method Not Allowed).
+    Serializes a response body with its processing time added.
+    Raw JSON objects are extended in place, so they are never parsed or validated,
+    and are returned unchanged if they already mention 'processing_time_seconds'.
 
     Args:
-        None
+        body (dict | bytes): The parsed body, or a raw JSON object starting with '{' and ending with '}'.
+        processing_time (float): The processing time in seconds.
 
     Returns:
-        func.HttpResponse: The HTTP response object with status code 405.
+        bytes: The serialized JSON body.
     """
-    return func.HttpResponse("Method not allowed", status_code=405)
+    if not isinstance(body, bytes):
+        body['processing_time_seconds'] = processing_time
+        return orjson.dumps(body)
+
+    # Avoid emitting a duplicate key
+    if b'"processing_time_seconds"' in body:
+        return body
+
+    # Insert the new key before the closing brace, with a comma unless the object is empty
+    body = body.rstrip()
+    i = len(body) - 2
+    while i >= 0 and body[i] in b" \t\r\n":
+        i -= 1
+    separator = b"" if body[i] == ord("{") else b","
+    return (body[:-1] + separator + b'"processing_time_seconds":'
+            + orjson.dumps(processing_time) + b"}")
 
 
 @app.route(route="refresh", methods=["POST"], auth_level=func.AuthLevel.ANONYMOUS)
-def refresh(req: func.HttpRequest) -> func.HttpResponse:
+async def refresh(req: func.HttpRequest) -> func.HttpResponse:
     """
     Refreshes the index by making a POST request to the refresh URL.
 
@@ -113,52 +351,41 @@ def refresh(req: func.HttpRequest) -> func.HttpResponse:
     Returns:
         func.HttpResponse: The HTTP response object containing the result of the refresh operation.
     """
-    # Track the start time to measure processing time
-    start = time()
-    logging.info(
-        f"Processing a request to refresh the index. Start time: {start}")
-
-    # Check if the request method is HTTP POST.
-    if req.method != 'POST':
-        return method_not_allowed()
+    # Track the start on a monotonic clock to measure processing time
+    start = monotonic_ns()
+    logger.info("Processing a request to refresh the index.")
 
     # Make a POST request to the refresh URL with the API key.
-    logging.info(f"Making a POST request to the refresh URL: {refresh_url}")
-    response = make_post_request(refresh_url, api_key)
-    response_body = json.loads(response.get_body().decode('utf-8'))
+    logger.info("Making a POST request to the refresh URL: %s", config.refresh_url)
+    status_code, response_body = await make_post_request(config.refresh_url)
 
     # Log the processing time and add it to the response
-    processing_time = time() - start
-    response_body['processing_time_seconds'] = processing_time
-    logging.info(f"Processing time: {processing_time} seconds")
+    processing_time = (monotonic_ns() - start) / 1e9
+    logger.info("Processing time: %s seconds", processing_time)
 
     return func.HttpResponse(
-        body=json.dumps(response_body),
-        status_code=response.status_code,
-        headers={"Content-Type": "application/json"}
+        body=dump_with_processing_time(response_body, processing_time),
+        status_code=status_code,
+        headers=JSON_HEADERS
     )
 
 # Route to handle chatbot requests by making a POST request to the specified URL with JSON data
 
 
 @app.route(route="chatbot", methods=["POST"], auth_level=func.AuthLevel.ANONYMOUS)
-def chatbot(req: func.HttpRequest) -> func.HttpResponse:
-    # Track the start time to measure processing time
-    start = time()
-    logging.info(f"Processing a request to the chatbot. Start time: {start}")
+async def chatbot(req: func.HttpRequest) -> func.HttpResponse:
+    # Track the start on a monotonic clock to measure processing time
+    start = monotonic_ns()
+    logger.info("Processing a request to the chatbot.")
 
-    # Check if the request method is HTTP POST.
-    if req.method != 'POST':
-        return method_not_allowed()
-
-    # Get the request body as a string
+    # Get the raw request body
     # Return an error response if the request body is empty
-    req_body = req.get_body().decode('utf-8') if req.get_body() else None
+    req_body = req.get_body()
     if not req_body:
         return func.HttpResponse("Request body is empty", status_code=400)
 
     # Parse the JSON body and obtain the question.
-    data = json.loads(req_body)
+    data = orjson.loads(req_body)
     question = data.get('message')
 
     # Return an error response if the question is not provided in the request
@@ -166,19 +393,115 @@ def chatbot(req: func.HttpRequest) -> func.HttpResponse:
         return func.HttpResponse("'message' not provided in the request", status_code=400)
 
     # Make a POST request to the chatbot URL with the API key and the question
-    logging.info(f"Making a POST request to the chatbot URL: {chatbot_url}")
-    response = make_post_request(chatbot_url, api_key, {"message": question})
-    response_body = json.loads(response.get_body().decode('utf-8'))
+    logger.info("Making a POST request to the chatbot URL: %s", config.chatbot_url)
+    status_code, response_body = await make_post_request(config.chatbot_url, {"message": question})
 
     # Log the processing time and add it to the response
-    processing_time = time() - start
-    response_body['processing_time_seconds'] = processing_time
-    logging.info(f"Processing time: {processing_time} seconds")
+    processing_time = (monotonic_ns() - start) / 1e9
+    logger.info("Processing time: %s seconds", processing_time)
 
     return func.HttpResponse(
-        body=json.dumps(response_body),
-        status_code=response.status_code,
-        headers={"Content-Type": "application/json"}
+        body=dump_with_processing_time(response_body, processing_time),
+        status_code=status_code,
+        headers=JSON_HEADERS
+    )
+
+
+async def ask_chatbot(message):
+    """
+    Sends one question of a batch to the chatbot.
+    Transport errors and invalid answers are turned into an error result, so they don't fail
+    the rest of the batch.
+
+    Args:
+        message (str): The question to send.
+
+    Returns:
+        tuple[int, dict]: The status code and the parsed body for this question.
+    """
+    try:
+        status_code, response_body = await make_post_request(
+            config.chatbot_url, {"message": message})
+    except httpx.HTTPError as e:
+        logger.error(
+            "An error occurred while making a POST request to %s: %s", config.chatbot_url, e)
+        return 502, {"result": "Bad Gateway"}
+
+    # Raw unwrapped answers are parsed here, so one invalid answer can't corrupt the batch response
+    if isinstance(response_body, bytes):
+        try:
+            response_body = orjson.loads(response_body)
+        except orjson.JSONDecodeError:
+            logger.warning(
+                "The response from %s is not a valid JSON string, returning the response as is",
+                config.chatbot_url)
+            response_body = {"result": response_body.decode("utf-8", "replace")}
+    return status_code, response_body
+
+
+@app.route(route="chatbot_batch", methods=["POST"], auth_level=func.AuthLevel.ANONYMOUS)
+async def chatbot_batch(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Sends several questions to the chatbot in a single invocation.
+    The questions are forwarded concurrently and the answers are returned in the same order.
+
+    Args:
+        req (func.HttpRequest): The HTTP request object with a 'messages' list in its JSON body.
+
+    Returns:
+        func.HttpResponse: The HTTP response object with one result per message.
+    """
+    # Track the start on a monotonic clock to measure processing time
+    start = monotonic_ns()
+    logger.info("Processing a batch request to the chatbot.")
+
+    # Get the raw request body
+    # Return an error response if the request body is empty
+    req_body = req.get_body()
+    if not req_body:
+        return func.HttpResponse("Request body is empty", status_code=400)
+
+    # Parse the JSON body and obtain the questions.
+    # Return an error response if the body is not a JSON object
+    try:
+        data = orjson.loads(req_body)
+    except orjson.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict):
+        return func.HttpResponse("Request body is not a valid JSON object", status_code=400)
+    messages = data.get('messages')
+
+    # Return an error response if the questions are not provided in the request
+    if not isinstance(messages, list) or not messages:
+        return func.HttpResponse("'messages' not provided in the request", status_code=400)
+    if not all(isinstance(message, str) and message for message in messages):
+        return func.HttpResponse("'messages' must only contain non-empty strings", status_code=400)
+    if len(messages) > MAX_BATCH_SIZE:
+        return func.HttpResponse(
+            f"'messages' can contain at most {MAX_BATCH_SIZE} questions", status_code=400)
+
+    # Make one POST request per question to the chatbot URL over the shared client
+    logger.info("Making %s POST requests to the chatbot URL: %s",
+                len(messages), config.chatbot_url)
+    responses = await asyncio.gather(*[
+        ask_chatbot(message) for message in messages
+    ])
+    results = [
+        {"status_code": status_code, "body": response_body}
+        for status_code, response_body in responses
+    ]
+
+    # Log the processing time and add it to the response
+    processing_time = (monotonic_ns() - start) / 1e9
+    logger.info("Processing time: %s seconds", processing_time)
+
+    return func.HttpResponse(
+        body=orjson.dumps({
+            "results": results,
+            "processing_time_seconds": processing_time
+        }),
+        status_code=200,
+        headers=JSON_HEADERS
     )
 
 
@@ -186,6 +509,10 @@ def chatbot(req: func.HttpRequest) -> func.HttpResponse:
 def upload(req: func.HttpRequest) -> func.HttpResponse:
     """
     Uploads a file to Azure Blob Storage.
+    The request body is the raw file, named by the 'x-filename' header or the 'filename' query parameter.
+    A JSON body with 'filename' and base64-encoded 'file' fields is still accepted for older clients,
+    whenever the request is sent as 'application/json' or names no file outside the body.
+    A JSON body with 'filename' and 'source_url' fields makes Blob Storage copy the file from that URL instead.
 
     Args:
         req (func.HttpRequest): The HTTP request object.
@@ -193,67 +520,146 @@ def upload(req: func.HttpRequest) -> func.HttpResponse:
     Returns:
         func.HttpResponse: The HTTP response object.
     """
-    # Track the start time to measure processing time
-    start = time()
-    logging.info(f"Processing a request to upload a file. Start time: {start}")
-
-    # Check if the request method is HTTP POST.
-    if req.method != 'POST':
-        return method_not_allowed()
+    # Track the start on a monotonic clock to measure processing time
+    start = monotonic_ns()
+    logger.info("Processing a request to upload a file.")
 
-    # Get the request body as a string
+    # Get the raw request body
     # Return an error response if the request body is empty
-    req_body = req.get_body().decode('utf-8') if req.get_body() else None
-    if not req_body:
+    file_content = req.get_body()
+    if not file_content:
         return func.HttpResponse("Request body is empty", status_code=400)
 
-    # Parse the JSON body and obtain the file name and file content
-    data = json.loads(req_body)
-    file_name = data.get('filename')
-    file_content = data.get('file')
+    # The body is the raw file and the file name comes from a header or the query string.
+    # Legacy clients send a JSON body with the file name and the base64-encoded file content instead,
+    # or a source URL for Blob Storage to copy the file from without it passing through this function.
+    source_url = None
+    file_name = req.headers.get("x-filename") or req.params.get("filename")
+    is_json = not file_name or req.headers.get(
+        "Content-Type", "").lower().startswith("application/json")
+    if is_json:
+        try:
+            data = orjson.loads(file_content)
+        except orjson.JSONDecodeError:
+            data = None
+        if not isinstance(data, dict):
+            return func.HttpResponse(
+                body=orjson.dumps(
+                    {"result": "Request body is not a valid JSON object"}),
+                status_code=400,
+                headers=JSON_HEADERS
+            )
+        file_name = data.get('filename')
+        file_content = data.get('file')
+        source_url = data.get('source_url')
 
     # Return an error response if the file name or file content is not provided in the request
-    if not file_name or not file_content:
+    if not file_name or not (file_content or source_url):
         return func.HttpResponse(
-            body=json.dumps(
+            body=orjson.dumps(
                 {"result": "File name or file content not provided in the request"}),
             status_code=400,
-            headers={"Content-Type": "application/json"}
+            headers=JSON_HEADERS
+        )
+
+    # Return an error response if the legacy file name or source URL is not a string
+    if not isinstance(file_name, str) or (source_url and not isinstance(source_url, str)):
+        return func.HttpResponse(
+            body=orjson.dumps(
+                {"result": "File name and source URL must be strings"}),
+            status_code=400,
+            headers=JSON_HEADERS
+        )
+
+    # Return an error response if both the file content and a source URL are provided
+    if file_content and source_url:
+        return func.HttpResponse(
+            body=orjson.dumps(
+                {"result": "Provide either the file content or a source URL, not both"}),
+            status_code=400,
+            headers=JSON_HEADERS
+        )
+
+    # Return an error response if the legacy file content is not valid base64
+    if is_json and file_content and (
+            not isinstance(file_content, str)
+            or len(file_content) & 3
+            or not BASE64_PATTERN.fullmatch(file_content)):
+        return func.HttpResponse(
+            body=orjson.dumps(
+                {"result": "File content is not valid base64"}),
+            status_code=400,
+            headers=JSON_HEADERS
         )
 
-    # Decode the base64-encoded file content
     response = {
         "loaded": False,
         "processing_time_seconds": 0
     }
 
+    # The client is built on the first upload, which is where the SDK validates the connection string
     try:
-        file_content = base64.b64decode(file_content)
+        container_client = get_container_client()
+    except ValueError as e:
+        logger.error("Blob Storage is misconfigured: %s", e)
+        return func.HttpResponse(
+            body=orjson.dumps({"result": "Internal Server Error"}),
+            status_code=500,
+            headers=JSON_HEADERS
+        )
 
+    try:
         # Get the BlobClient for the specified file name
-        blob_client = blob_service_client.get_blob_client(
-            container=container_name,
-            blob=file_name
-        )
+        blob_client = container_client.get_blob_client(file_name)
 
         # Upload the file content to the Blob Storage
-        blob_client.upload_blob(file_content, overwrite=True)
+        if source_url:
+            # Blob Storage fetches the file server-side
+            # A 4xx means the source could not be copied (not found, not authorized, unreachable)
+            try:
+                blob_client.upload_blob_from_url(source_url, overwrite=True)
+            except HttpResponseError as e:
+                if e.status_code is None or not 400 <= e.status_code < 500:
+                    raise
+                logger.warning(
+                    "Could not copy the file from the source URL (HTTP %s): %s", e.status_code, e.error_code)
+                return func.HttpResponse(
+                    body=orjson.dumps({
+                        "result": "The file could not be copied from the source URL",
+                        "error_code": e.error_code
+                    }),
+                    status_code=400,
+                    headers=JSON_HEADERS
+                )
+        elif is_json:
+            # Decode the file content block by block while it is uploaded
+            stream = io.BufferedReader(
+                Base64DecodeStream(file_content), buffer_size=BLOCK_SIZE)
+            blob_client.upload_blob(
+                stream,
+                length=decoded_length(file_content),
+                overwrite=True,
+                max_concurrency=4
+            )
+        else:
+            blob_client.upload_blob(
+                file_content, overwrite=True, max_concurrency=4)
         response["loaded"] = True
-    except Exception as e:
-        logging.error(f"An error occurred while uploading the file: {e}")
+    except (AzureError, Base64Error) as e:
+        logger.error("An error occurred while uploading the file: %s", e)
         return func.HttpResponse(
-            body=json.dumps({"result": "Internal Server Error"}),
+            body=orjson.dumps({"result": "Internal Server Error"}),
             status_code=500,
-            headers={"Content-Type": "application/json"}
+            headers=JSON_HEADERS
         )
 
     # Log the processing time and add it to the response
-    processing_time = time() - start
-    logging.info(f"Processing time: {processing_time} seconds")
+    processing_time = (monotonic_ns() - start) / 1e9
+    logger.info("Processing time: %s seconds", processing_time)
     response["processing_time_seconds"] = processing_time
 
     return func.HttpResponse(
-        body=json.dumps(response),
+        body=orjson.dumps(response),
         status_code=200,
-        headers={"Content-Type": "application/json"}
+        headers=JSON_HEADERS
     )